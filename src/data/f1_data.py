@@ -1,4 +1,7 @@
 # f1data.py
+import queue
+import threading
+
 import fastf1
 
 class F1Session:
@@ -20,10 +23,82 @@ class F1Session:
         return self.session.car_data(driver)
     
     def get_weather_data(self):
-        return self.session.weather_data()
+        return self.session.weather_data
+
+    def get_track_status(self):
+        return self.session.track_status
     
     def get_circuit_info(self):
         return self.session.get_circuit_info()
     
     def __getattr__(self, name):
-        return getattr(self.session, name)
\ No newline at end of file
+        return getattr(self.session, name)
+
+
+_END_OF_SESSIONS = object()
+
+def prefetch_sessions(session_specs, max_prefetch: int=2, loader=F1Session):
+    """
+    Yields ((year, gp, session), F1Session) pairs while a background thread loads the
+    following sessions, so FastF1 download/cache I/O overlaps with processing.
+
+    At most max_prefetch loaded sessions wait in the queue; the loader blocks when it is
+    full, keeping memory bounded to max_prefetch + 2 sessions (queued, being loaded and
+    being processed). Loading errors, and errors raised while iterating session_specs, are
+    re-raised in the consuming thread.
+
+    Parameters:
+        session_specs: iterable of (year, gp, session) tuples
+        max_prefetch: number of sessions to load ahead of the consumer
+        loader: callable(year, gp, session) returning a loaded session
+    """
+    session_queue = queue.Queue(maxsize=max(max_prefetch, 1))
+    stop = threading.Event()
+
+    def put(item):
+        # retry so the producer notices stop while blocked on a full queue
+        while not stop.is_set():
+            try:
+                session_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for spec in session_specs:
+                if stop.is_set():
+                    return
+                try:
+                    item = (spec, loader(*spec), None)
+                except Exception as error:
+                    item = (spec, None, error)
+                if not put(item):
+                    return
+        except Exception as error:
+            # errors from iterating session_specs itself (e.g. a schedule lookup) must not
+            # look like the end of the season to the consumer
+            put((None, None, error))
+        finally:
+            put(_END_OF_SESSIONS)
+
+    producer = threading.Thread(target=produce, name='f1-session-prefetch', daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = session_queue.get()
+            if item is _END_OF_SESSIONS:
+                break
+            spec, session, error = item
+            if error is not None and spec is None:
+                raise RuntimeError("Failed to read session specs") from error
+            if error is not None:
+                raise RuntimeError(f"Failed to load session {spec}") from error
+            yield spec, session
+            # drop our reference before blocking on the next session
+            del session, item
+    finally:
+        stop.set()
+        producer.join(timeout=1)
@@ -0,0 +1,213 @@
+# feature_store.py
+import functools
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.f1_constants import F1Constants
+
+INDEX_COLUMNS = ['Year', 'Event', 'Session', 'Driver', 'Turn', 'LapNumber']
+
+# session names used in export file names -> F1Constants.SESSIONS codes
+SESSION_TOKENS = {
+    'fp1': 'FP1',
+    'fp2': 'FP2',
+    'fp3': 'FP3',
+    'qualifying': 'Q',
+    'sprintqualifying': 'SQ',
+    'sprint': 'S',
+    'grandprix': 'R',
+    'race': 'R',
+}
+
+RANGE_OPERATORS = {
+    'gt': np.greater,
+    'gte': np.greater_equal,
+    'lt': np.less,
+    'lte': np.less_equal,
+    'ne': np.not_equal,
+}
+
+class FeatureStore:
+    """
+    In-memory store of exported feature / cluster tables with hash indexes on
+    (Year, Event, Session, Driver, Turn, LapNumber).
+
+    Equality filters on indexed columns are resolved by intersecting index row positions
+    before any other filter, projection or pagination touches the table. Query responses
+    are cached in an LRU keyed on the normalized query.
+    """
+
+    def __init__(self, cache_size: int=1024):
+        self.tables = {}
+        self.indexes = {}
+        self._query_cached = functools.lru_cache(maxsize=cache_size)(self._query)
+
+    def add_table(self, name, df, **keys):
+        """
+        Registers df under name. Keyword arguments (e.g. Year=2025, Event='Bahrain') are
+        added as constant columns when the table doesn't already carry them.
+        """
+        df = df.reset_index(drop=True)
+        missing_keys = {key: value for key, value in keys.items() if value is not None and key not in df.columns}
+        if missing_keys:
+            df = df.assign(**missing_keys)
+
+        self.tables[name] = df
+        self.indexes[name] = {}
+        for col in INDEX_COLUMNS:
+            if col not in df.columns:
+                continue
+            try:
+                self.indexes[name][col] = {
+                    _normalize(value): np.asarray(positions)
+                    for value, positions in df.groupby(col, sort=False).indices.items()
+                }
+            except TypeError:
+                # unhashable values (e.g. lists) can't be indexed; filters fall back to a scan
+                continue
+
+        self._query_cached.cache_clear()
+
+    def load_exports(self, exports_dir='notebooks/exports'):
+        """
+        Loads every pickle under exports_dir. Table names are '<subdir>/<file stem>'; a
+        leading '<year>_<location>_' in the file name is used for Year and Event (the FastF1
+        EventName, e.g. 'bahrain' -> 'Bahrain Grand Prix', matching season spill tables) and a
+        session token (e.g. 'grandprix' -> 'R', 'qualifying' -> 'Q') for Session when missing.
+        LapNumber is only indexed when the exported table carries it.
+        """
+        for path in sorted(glob.glob(os.path.join(exports_dir, '**', '*.pkl'), recursive=True)):
+            df = pd.read_pickle(path)
+            if not isinstance(df, pd.DataFrame):
+                continue
+            rel_path = os.path.relpath(path, exports_dir)
+            name = os.path.splitext(rel_path)[0].replace(os.sep, '/')
+            tokens = os.path.basename(name).split('_')
+            year = int(tokens[0]) if tokens[0].isdigit() else None
+            event, n_event_tokens = _parse_event(tokens[1:]) if year is not None else (None, 0)
+            session = next((SESSION_TOKENS[token] for token in tokens[1 + n_event_tokens:] if token in SESSION_TOKENS), None)
+            self.add_table(name, df, Year=year, Event=event, Session=session)
+
+    def describe(self):
+        """
+        Returns {table name: {'rows': n, 'columns': [...], 'indexed': [...]}}.
+        """
+        return {
+            name: {
+                'rows': len(df),
+                'columns': df.columns.tolist(),
+                'indexed': list(self.indexes[name].keys()),
+            }
+            for name, df in self.tables.items()
+        }
+
+    def query(self, table, filters=None, columns=None, offset=0, limit=100):
+        """
+        Returns (total_matches, page_df) for a table. page_df is a copy, so callers can
+        modify it without changing cached results.
+
+        Parameters:
+            table: registered table name
+            filters: dict of column -> value or list of values (equality), or
+                     'column__op' -> value with op in gt/gte/lt/lte/ne
+            columns: list of columns to return (all when None)
+            offset, limit: pagination over matching rows (non-negative)
+        """
+        if int(offset) < 0 or int(limit) < 0:
+            raise ValueError("offset and limit must be non-negative")
+        filters = filters or {}
+        normalized_filters = tuple(sorted(
+            (key, tuple(_normalize(v) for v in value) if isinstance(value, (list, tuple)) else _normalize(value))
+            for key, value in filters.items()
+        ))
+        total, page = self._query_cached(table, normalized_filters, tuple(columns) if columns else None, int(offset), int(limit))
+        return total, page.copy()
+
+    def _query(self, table, filters, columns, offset, limit):
+        if table not in self.tables:
+            raise KeyError(f"Unknown table: {table}")
+        df = self.tables[table]
+        index = self.indexes[table]
+
+        # equality filters on indexed columns: intersect row positions
+        positions = None
+        scan_filters = []
+        for key, value in filters:
+            col, _, op = key.partition('__')
+            if not op and col in index:
+                values = value if isinstance(value, tuple) else (value,)
+                matches = [index[col].get(v, np.empty(0, dtype=int)) for v in values]
+                matched = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=int)
+                positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+            else:
+                scan_filters.append((col, op, value))
+
+        subset = df if positions is None else df.iloc[positions]
+
+        # remaining filters only scan rows that survived the index lookup
+        for col, op, value in scan_filters:
+            if col not in subset.columns:
+                raise KeyError(f"Unknown column: {col}")
+            if op:
+                if op not in RANGE_OPERATORS:
+                    raise ValueError(f"Unsupported operator: {op}")
+                mask = RANGE_OPERATORS[op](subset[col].to_numpy(), value)
+            elif isinstance(value, tuple):
+                mask = subset[col].isin(value).to_numpy()
+            else:
+                mask = (subset[col] == value).to_numpy()
+            subset = subset[mask]
+
+        if columns is not None:
+            unknown = [col for col in columns if col not in subset.columns]
+            if unknown:
+                raise KeyError(f"Unknown column(s): {unknown}")
+            subset = subset[list(columns)]
+
+        return len(subset), subset.iloc[offset:offset + limit]
+
+    def coerce_value(self, table, col, value):
+        """
+        Converts a query string value to the dtype of table[col].
+        """
+        df = self.tables[table]
+        if col not in df.columns:
+            return value
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            return value.lower() in ('1', 'true', 'yes')
+        if pd.api.types.is_integer_dtype(dtype):
+            return int(float(value))
+        if pd.api.types.is_numeric_dtype(dtype):
+            return float(value)
+        if dtype == object:
+            # object columns may still hold numbers (e.g. Turn)
+            sample = df[col].dropna()
+            if len(sample) and isinstance(sample.iloc[0], (int, float, np.integer, np.floating)):
+                return float(value) if '.' in value else int(value)
+        return value
+
+def _parse_event(tokens):
+    """
+    Matches the leading file name tokens against the F1Constants.EVENT_NAMES locations (e.g. ['abu', 'dhabi', ...]).
+    Returns (FastF1 EventName, tokens consumed); unknown locations fall back to the title-cased token.
+    """
+    for location in sorted(F1Constants.EVENT_NAMES, key=len, reverse=True):
+        location_tokens = location.lower().split()
+        if tokens[:len(location_tokens)] == location_tokens:
+            return F1Constants.EVENT_NAMES[location], len(location_tokens)
+    return (tokens[0].title(), 1) if tokens else (None, 0)
+
+def _normalize(value):
+    """
+    Converts numpy scalars to Python scalars (and whole floats to int) so index keys and
+    query values compare and hash consistently.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
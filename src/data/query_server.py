@@ -0,0 +1,100 @@
+# query_server.py
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from src.data.feature_store import FeatureStore
+
+RESERVED_PARAMS = {'columns', 'offset', 'limit'}
+MAX_LIMIT = 10000
+
+def make_handler(store: FeatureStore):
+    """
+    Returns a request handler class serving store:
+
+        GET /tables                  -> table names, row counts, columns and indexed columns
+        GET /tables/<name>?<query>   -> matching rows as JSON
+
+    Query parameters: column=value (comma-separated values for OR), column__gt/gte/lt/lte/ne=value,
+    columns=a,b,c for projection, offset and limit for pagination.
+    """
+
+    class FeatureQueryHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            path = unquote(url.path).rstrip('/')
+
+            if path == '/tables':
+                return self._send_json(200, json.dumps(store.describe()))
+
+            if path.startswith('/tables/'):
+                table = path[len('/tables/'):]
+                if table not in store.tables:
+                    return self._send_json(404, json.dumps({'error': f"Unknown table: {table}"}))
+                try:
+                    return self._send_json(200, self._query_table(table, parse_qs(url.query)))
+                except (KeyError, ValueError) as error:
+                    return self._send_json(400, json.dumps({'error': error.args[0] if error.args else str(error)}))
+
+            return self._send_json(404, json.dumps({'error': f"Unknown path: {path}"}))
+
+        def _query_table(self, table, params):
+            filters = {}
+            for key, values in params.items():
+                if key in RESERVED_PARAMS:
+                    continue
+                col = key.partition('__')[0]
+                parsed = [store.coerce_value(table, col, v) for value in values for v in value.split(',')]
+                filters[key] = parsed[0] if len(parsed) == 1 else parsed
+
+            columns = params['columns'][0].split(',') if 'columns' in params else None
+            offset = int(params.get('offset', ['0'])[0])
+            limit = min(int(params.get('limit', ['100'])[0]), MAX_LIMIT)
+
+            total, page = store.query(table, filters=filters, columns=columns, offset=offset, limit=limit)
+
+            # rows are serialized by pandas directly into the response body
+            return (
+                f'{{"table": {json.dumps(table)}, "total": {total}, "offset": {offset}, '
+                f'"limit": {limit}, "rows": {page.to_json(orient="records")}}}'
+            )
+
+        def _send_json(self, status, body):
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FeatureQueryHandler
+
+def serve(exports_dir='notebooks/exports', host='127.0.0.1', port=8765):
+    """
+    Loads every exported table under exports_dir and serves queries until interrupted.
+    """
+    store = FeatureStore()
+    store.load_exports(exports_dir)
+
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    print(f"Serving {len(store.tables)} tables from {exports_dir} at http://{host}:{port}/tables")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query server for exported driver-style features.')
+    parser.add_argument('--exports', default='notebooks/exports')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    serve(args.exports, args.host, args.port)
@@ -7,6 +7,8 @@ from sklearn.cluster import HDBSCAN as _HDBSCAN
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 
+from src.utils.result_cache import result_cache
+
 pkl_path = 'notebooks/exports/final_features/2025_bahrain_sector2_grandprix.pkl'
 df = pd.read_pickle(pkl_path)
 min_cluster_size = 9
@@ -19,6 +21,10 @@ def perform_hdbscan_clustering(df, min_cluster_size, min_samples):
         pd.DataFrame: DataFrame with an additional 'Cluster' column.
     """
 
+    # exports made before LapNumber was added to the feature rows lack it; session keys are
+    # only present on season tables (e.g. join_lap_conditions output)
+    optional_key_cols = [col for col in ['LapNumber', 'Year', 'Event', 'Session'] if col in df.columns]
+
     # Comment out feature columns to be included in clustering
     X = df.drop(columns=[
         'Driver',
@@ -48,19 +54,28 @@ def perform_hdbscan_clustering(df, min_cluster_size, min_samples):
         'ExitAccelDuration',
         'TurnDuration',
         'ExitSpeed'
-    ])
+    ] + optional_key_cols)
 
     X = X.fillna(0) # Handle missing values
     scaler = StandardScaler() # scaler instance
     X_scaled = scaler.fit_transform(X) # normalizes input data fit() + transform()
     X_features = scaler.get_feature_names_out(X.columns) # original column names
-    clusterer = _HDBSCAN(min_cluster_size, min_samples) # clustering model
-    labels = clusterer.fit_predict(X_scaled) # assign cluster labels to data points
-    probabilities = clusterer.probabilities_ # probability of each point belonging to its assigned cluster
+    labels, probabilities = _fit_hdbscan(X_scaled, min_cluster_size, min_samples) # cached on scaled features + parameters
     df['Cluster'] = labels # add cluster labels to dataframe
     
     return (X_scaled, labels, probabilities, df, X_features)
 
+@result_cache.memoize('hdbscan')
+def _fit_hdbscan(X_scaled, min_cluster_size, min_samples):
+    """
+    Fits HDBSCAN on the scaled feature matrix.
+    Returns cluster labels and membership probabilities.
+    """
+    clusterer = _HDBSCAN(min_cluster_size, min_samples) # clustering model
+    labels = clusterer.fit_predict(X_scaled) # assign cluster labels to data points
+    probabilities = clusterer.probabilities_ # probability of each point belonging to its assigned cluster
+    return labels, probabilities
+
 def plot_hdbscan_clustering(X, labels, probabilities=None, parameters=None, ground_truth=False, ax=None, min_cluster_size=None, min_samples=None):
     """
     Plot HDBSCAN clustering results.
@@ -0,0 +1,137 @@
+import pickle
+
+import numpy as np
+from sklearn.neighbors import BallTree, KDTree
+
+TRACE_CHANNELS = ['Speed (m/s)', 'Throttle (%)', 'BrakesApplied']
+
+def resample_traces(corner_telemetry_list, channels=TRACE_CHANNELS, n_points=100, distance_col='Distance (m)'):
+    """
+    Resamples each lap's corner telemetry onto n_points evenly spaced along the distance
+    travelled through the corner, so laps of different lengths become comparable vectors.
+
+    Returns:
+        np.ndarray of shape (laps, len(channels) * n_points)
+    """
+    grid = np.linspace(0, 1, n_points)
+    traces = np.zeros((len(corner_telemetry_list), len(channels) * n_points))
+
+    for i, corner_df in enumerate(corner_telemetry_list):
+        distance = corner_df[distance_col].to_numpy(dtype=float)
+        span = distance[-1] - distance[0]
+        position = (distance - distance[0]) / span if span > 0 else np.linspace(0, 1, len(distance))
+        for j, channel in enumerate(channels):
+            traces[i, j * n_points:(j + 1) * n_points] = np.interp(grid, position, corner_df[channel].to_numpy(dtype=float))
+
+    return traces
+
+def _scale_traces(traces, scale, n_points):
+    """
+    Divides each channel block of flattened traces by its per-channel scale.
+    """
+    n_laps = len(traces)
+    return (traces.reshape(n_laps, len(scale), n_points) / scale[None, :, None]).reshape(n_laps, -1)
+
+
+class LapSimilarityIndex:
+    """
+    Nearest-neighbour index over lap vectors: either the scaled corner feature matrix from
+    perform_hdbscan_clustering or resampled speed/throttle/brake traces.
+    Uses a KD-tree for low-dimensional features and a ball tree otherwise.
+    """
+
+    def __init__(self, vectors, metadata, leaf_size=40):
+        """
+        Parameters:
+            vectors: np.ndarray (laps, dims), already scaled
+            metadata: pd.DataFrame with one row per lap (e.g. Driver, Turn, LapNumber)
+        """
+        self.vectors = np.ascontiguousarray(vectors, dtype=float)
+        self.metadata = metadata.reset_index(drop=True)
+        self.trace_params = None
+        tree_cls = KDTree if self.vectors.shape[1] <= 20 else BallTree
+        self.tree = tree_cls(self.vectors, leaf_size=leaf_size)
+
+    @classmethod
+    def from_scaled_features(cls, X_scaled, df_clustered,
+                             metadata_cols=('Year', 'Event', 'Session', 'Driver', 'Turn', 'LapNumber', 'Cluster')):
+        """
+        Builds the index from perform_hdbscan_clustering output (X_scaled, df).
+        Metadata keeps whichever of metadata_cols the table has; session keys are present on
+        season tables from load_spilled_features(with_keys=True).
+        """
+        metadata = df_clustered[[col for col in metadata_cols if col in df_clustered.columns]]
+        return cls(X_scaled, metadata)
+
+    @classmethod
+    def from_traces(cls, corner_telemetry_list, metadata, channels=TRACE_CHANNELS, n_points=100):
+        """
+        Builds the index from corner telemetry traces, scaling each channel by its standard
+        deviation so speed, throttle and brake carry equal weight.
+        """
+        traces = resample_traces(corner_telemetry_list, channels=channels, n_points=n_points)
+        scale = traces.reshape(len(traces), len(channels), n_points).std(axis=(0, 2))
+        scale = np.where(scale > 0, scale, 1.0)
+
+        index = cls(_scale_traces(traces, scale, n_points), metadata)
+        index.trace_params = {'channels': list(channels), 'n_points': n_points, 'scale': scale}
+        return index
+
+    def query(self, vectors, k=5):
+        """
+        Returns the k nearest laps for each query vector as a DataFrame with
+        QueryIndex, Distance and the lap metadata.
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=float))
+        distances, indices = self.tree.query(vectors, k=min(k, len(self.vectors)))
+
+        neighbours = self.metadata.iloc[indices.ravel()].reset_index().rename(columns={'index': 'LapIndex'})
+        neighbours.insert(0, 'QueryIndex', np.repeat(np.arange(len(vectors)), indices.shape[1]))
+        neighbours.insert(1, 'Distance', distances.ravel())
+        return neighbours
+
+    def query_traces(self, corner_telemetry_list, k=5):
+        """
+        Returns the k nearest indexed laps for new corner telemetry, resampled and scaled
+        the same way as the traces the index was built from.
+        """
+        if self.trace_params is None:
+            raise ValueError("Index was not built with from_traces")
+        traces = resample_traces(
+            corner_telemetry_list,
+            channels=self.trace_params['channels'],
+            n_points=self.trace_params['n_points']
+        )
+        return self.query(_scale_traces(traces, self.trace_params['scale'], self.trace_params['n_points']), k=k)
+
+    def query_lap(self, lap_index, k=5, exclude_driver=True, driver_col='Driver'):
+        """
+        Returns the k laps most similar to an indexed lap, excluding the lap itself and,
+        by default, other laps from the same driver.
+        """
+        exclude_driver = exclude_driver and driver_col in self.metadata.columns
+        k_search = k + 1
+        while True:
+            neighbours = self.query(self.vectors[lap_index], k=k_search)
+            neighbours = neighbours[neighbours['LapIndex'] != lap_index]
+            if exclude_driver:
+                neighbours = neighbours[neighbours[driver_col] != self.metadata.loc[lap_index, driver_col]]
+            # widen the search until enough laps from other drivers are found
+            if len(neighbours) >= k or k_search >= len(self.vectors):
+                return neighbours.head(k).reset_index(drop=True)
+            k_search *= 4
+
+    def save(self, path):
+        """
+        Pickles the index (tree, vectors and metadata) to path.
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        """
+        Loads an index saved with save().
+        """
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
+from scipy.signal import savgol_filter
 
 class TelemetryFeatures:
     def __init__(self, df):
         self.df = df
+        self._input_df = df
 
     def acceleration(self, speed='Speed (m/s)', sector_time='SectorTime (s)'):
         """
@@ -70,38 +72,44 @@ class TelemetryFeatures:
         self.df[time_col] = self.df[time_col] - self.df[time_col].iloc[0]
         return self
 
+    def curvature(self,
+                  x_col='X (1/10 m)',
+                  y_col='Y (1/10 m)',
+                  speed_col='Speed (m/s)',
+                  time_col='SectorTime (s)',
+                  group_cols=None,
+                  window_length=11,
+                  polyorder=3,
+                  wheelbase=3.6,
+                  steering_ratio=15):
+        """
+        Adds smoothed heading, yaw rate, curvature, lateral acceleration/g-force and
+        steering wheel angle columns (see curvature_features).
+        """
+        # earlier steps leave self.df as a private copy; only the caller's frame is copied
+        self.df = curvature_features(
+            self.df, x_col=x_col, y_col=y_col, speed_col=speed_col, time_col=time_col,
+            group_cols=group_cols, window_length=window_length, polyorder=polyorder,
+            wheelbase=wheelbase, steering_ratio=steering_ratio,
+            inplace=self.df is not self._input_df
+        )
+        return self
+
     def steering_wheel_angle(self, 
                             x_col='X (1/10 m)', 
                             y_col='Y (1/10 m)', 
                             speed_col='Speed (m/s)', 
                             wheelbase=3.6, 
-                            steering_ratio=15):
-
-        df = self.df.copy()
-
-        # Convert from tenths of meters to meters
-        dx = df[x_col].diff() / 10
-        dy = df[y_col].diff() / 10
-
-        # Heading angle
-        yaw = np.arctan2(dy, dx)
-
-        # Time delta (stabilized)
-        dt = df['SectorTime (s)'].diff().clip(lower=1e-4)
-
-        # Yaw rate (rad/s)
-        yaw_rate = yaw.diff() / dt
-        yaw_rate = yaw_rate.fillna(0)
-
-        # Front wheel angle (rad)
-        front_wheel_angle = np.arctan((wheelbase * yaw_rate) / df[speed_col].clip(lower=0.1))
-
-        # Steering wheel angle (deg)
-        df['Steering Wheel Angle (°)'] = np.degrees(front_wheel_angle) * steering_ratio
-        df['Steering Wheel Angle (°)'] = df['Steering Wheel Angle (°)'].fillna(0)
-
-        self.df = df
-        return self
+                            steering_ratio=15,
+                            time_col='SectorTime (s)'):
+        """
+        Estimates steering wheel angle from the smoothed path curvature using a kinematic
+        bicycle model: angle = steering_ratio * atan(wheelbase * curvature).
+        """
+        return self.curvature(
+            x_col=x_col, y_col=y_col, speed_col=speed_col, time_col=time_col,
+            wheelbase=wheelbase, steering_ratio=steering_ratio
+        )
     
     def get_features_df(self):
         """
@@ -145,4 +153,128 @@ class TelemetryFeatures:
             "ExitSpeed": exit_speed,
             "ExitAccelDuration": exit_accel_duration,
             "TurnDuration": exit_speed_ts
-        }
\ No newline at end of file
+        }
+
+def curvature_features(df,
+                       x_col='X (1/10 m)',
+                       y_col='Y (1/10 m)',
+                       speed_col='Speed (m/s)',
+                       time_col='SectorTime (s)',
+                       group_cols=None,
+                       window_length=11,
+                       polyorder=3,
+                       wheelbase=3.6,
+                       steering_ratio=15,
+                       inplace=False):
+    """
+    Vectorized heading, yaw rate, curvature, lateral acceleration and steering wheel angle
+    for one lap or many stacked laps (e.g. a whole season's corner telemetry).
+
+    Laps (rows sharing group_cols, in time order) are laid out as a (laps, samples) matrix,
+    linearly extended past their last sample, and smoothed with a Savitzky-Golay filter
+    along each row. Derivatives are taken per sample and divided by dt/dsample, so the
+    uneven FastF1 sample spacing is handled; heading is unwrapped before differentiating.
+
+    group_cols defaults to lap_group_columns(df), so the same lap number from different
+    drivers or sessions is never treated as one trace.
+
+    Returns a copy of df with the new columns appended, or df itself with inplace=True
+    (avoids copying season-sized frames).
+    """
+    n_rows = len(df)
+    group_cols = lap_group_columns(df) if group_cols is None else [col for col in group_cols if col in df.columns]
+    if group_cols and n_rows:
+        codes = df.groupby(group_cols, sort=False, dropna=False).ngroup().to_numpy()
+    else:
+        codes = np.zeros(n_rows, dtype=int)
+
+    result = {
+        'Heading (rad)': np.full(n_rows, np.nan),
+        'Yaw Rate (rad/s)': np.full(n_rows, np.nan),
+        'Curvature (1/m)': np.full(n_rows, np.nan),
+        'Lateral Acceleration (m/s²)': np.full(n_rows, np.nan),
+        'Lateral G-force (g)': np.full(n_rows, np.nan),
+        'Steering Wheel Angle (°)': np.full(n_rows, np.nan),
+    }
+    if n_rows == 0:
+        return _with_columns(df, result, inplace)
+
+    positions = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    lengths = np.bincount(codes)
+    n_laps, max_len = len(lengths), lengths.max()
+    rows = np.arange(n_laps)[:, None]
+    last = lengths[:, None] - 1
+    pad_idx = np.minimum(np.arange(max_len), last)
+    excess = np.arange(max_len) - pad_idx
+
+    def to_matrix(values):
+        # stack laps row-wise and extend each lap linearly past its last sample
+        matrix = np.zeros((n_laps, max_len))
+        matrix[codes, positions] = values
+        slope = np.where(last > 0, matrix[rows, last] - matrix[rows, np.maximum(last - 1, 0)], 0.0)
+        return matrix[rows, pad_idx] + excess * slope
+
+    time = df[time_col]
+    if not pd.api.types.is_numeric_dtype(time):
+        time = pd.to_timedelta(time, errors='coerce').dt.total_seconds()
+
+    x = to_matrix(df[x_col].to_numpy(dtype=float) / 10)
+    y = to_matrix(df[y_col].to_numpy(dtype=float) / 10)
+    t = to_matrix(time.to_numpy(dtype=float))
+
+    # window must be odd, no longer than the longest lap and greater than polyorder
+    window_length = min(window_length, max_len if max_len % 2 else max_len - 1)
+    polyorder = min(polyorder, window_length - 1)
+
+    def smooth(matrix, deriv):
+        return savgol_filter(matrix, window_length, polyorder, deriv=deriv, axis=1, mode='interp')
+
+    dx, dy, dt = smooth(x, 1), smooth(y, 1), smooth(t, 1)
+    ddx, ddy = smooth(x, 2), smooth(y, 2)
+    dt = np.clip(dt, 1e-4, None)
+
+    heading = np.unwrap(np.arctan2(dy, dx), axis=1)
+    yaw_rate = np.gradient(heading, axis=1) / dt if max_len > 1 else np.zeros_like(heading)
+    curvature = (dx * ddy - dy * ddx) / np.clip((dx**2 + dy**2)**1.5, 1e-9, None)
+
+    speed = pd.to_numeric(df[speed_col], errors='coerce').to_numpy(dtype=float)
+    curvature_rows = curvature[codes, positions]
+    lateral_accel = speed**2 * curvature_rows
+
+    result['Heading (rad)'] = heading[codes, positions]
+    result['Yaw Rate (rad/s)'] = yaw_rate[codes, positions]
+    result['Curvature (1/m)'] = curvature_rows
+    result['Lateral Acceleration (m/s²)'] = lateral_accel
+    result['Lateral G-force (g)'] = np.abs(lateral_accel / 9.80665)
+    result['Steering Wheel Angle (°)'] = np.degrees(np.arctan(wheelbase * curvature_rows)) * steering_ratio
+
+    return _with_columns(df, result, inplace)
+
+def _with_columns(df, columns, inplace):
+    """
+    Adds columns (name -> array) to df in place, or to a copy of df.
+    """
+    if not inplace:
+        return df.assign(**columns)
+    for col, values in columns.items():
+        df[col] = values
+    return df
+
+def lap_group_columns(df):
+    """
+    Returns the columns identifying a single lap in a stacked telemetry frame:
+    DriverCode and LapNumber plus any Year/Event/Session keys present.
+    """
+    return [col for col in ['Year', 'Event', 'Session', 'DriverCode', 'LapNumber'] if col in df.columns]
+
+def lateral_g_summary(df, group_cols=None, lateral_g='Lateral G-force (g)'):
+    """
+    Returns per-lap lateral g statistics (max, mean, SD) for telemetry enriched by
+    curvature_features, aggregated in one groupby over the same lap key.
+    """
+    group_cols = lap_group_columns(df) if group_cols is None else list(group_cols)
+    return (
+        df.groupby(group_cols, sort=False)[lateral_g]
+        .agg(MaxLateralGs='max', MeanLateralGs='mean', SDLateralGs='std')
+        .reset_index()
+    )
@@ -0,0 +1,197 @@
+import gc
+import json
+import os
+import shutil
+
+import fastf1
+import pandas as pd
+
+from src.data import f1_data
+from src.utils import f1_pandas_helpers, telemetry_codec
+from src.preprocessing import telemetry_cleaning, telemetry_processing, session_conditions
+
+CONDITION_TABLES = ['laps', 'weather', 'track_status']
+MANIFEST_NAME = 'manifest.json'
+
+def get_season_events(year: int):
+    """
+    Returns list of event names for a season, excluding pre-season testing.
+    """
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    return schedule['EventName'].tolist()
+
+def process_season_out_of_core(year, session_type, critical_turn, radius, start, end, spill_dir,
+                               events=None, drivers=None, safety_car_laps=None,
+                               chunk_size=50, spill_telemetry=False, max_prefetch=1,
+                               archive_raw_telemetry=False):
+    """
+    Out-of-core processing of every event in a season.
+
+    Sessions are loaded in a background thread (prefetch_sessions) while the current one is
+    processed, laps are streamed through iter_driver_corner_features, and feature rows are
+    spilled to pickle chunks under spill_dir every chunk_size laps. Peak memory is bounded by
+    the prefetched sessions plus one chunk, regardless of how many events are processed.
+
+    Each processed session's directory is cleared before spilling, and the run's chunk paths
+    are written to spill_dir/manifest.json, which the load_spilled_* functions read from, so
+    rerunning into the same spill_dir never mixes results from different runs.
+
+    Parameters:
+        year: season year
+        session_type: 'R', 'Q', ... from F1Constants.SESSIONS
+        critical_turn: turn number to isolate
+        radius: radius around the turn to isolate corner telemetry
+        start, end: sector timestamp keys, as in process_driver_telemetry
+        spill_dir: directory intermediate results are written to
+        events: list of event names (defaults to the full season schedule)
+        drivers: list of driver codes (defaults to every driver in each session)
+        safety_car_laps: dict of event name -> lap numbers to exclude
+                         (defaults to laps detected from TrackStatus)
+        chunk_size: number of laps buffered before spilling to disk
+        spill_telemetry: also spill each lap's enriched corner telemetry
+        max_prefetch: number of sessions loaded ahead of the one being processed
+        archive_raw_telemetry: also write each driver's raw lap telemetry to a compressed
+                               '<driver>_raw.f1tc' archive (read back with
+                               telemetry_codec.TelemetryArchive)
+
+    Returns:
+        list of spilled feature chunk paths
+    """
+    events = get_season_events(year) if events is None else events
+    os.makedirs(spill_dir, exist_ok=True)
+    spilled_paths = []
+    session_dirs = []
+
+    # an interrupted run leaves no manifest rather than one pointing at cleared chunks
+    manifest_path = os.path.join(spill_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    session_specs = [(year, event, session_type) for event in events]
+
+    for (_, event, _), session in f1_data.prefetch_sessions(session_specs, max_prefetch=max_prefetch):
+        session_dir = _session_dir_name(year, event, session_type)
+        event_dir = os.path.join(spill_dir, session_dir)
+        # drop chunks from earlier runs (other radii, turns or chunk sizes)
+        shutil.rmtree(event_dir, ignore_errors=True)
+        os.makedirs(event_dir)
+        session_dirs.append(session_dir)
+
+        # lap times, weather and track status for join_lap_conditions
+        conditions = session_conditions.get_session_conditions([((year, event, session_type), session)])
+        for name, conditions_df in zip(CONDITION_TABLES, conditions):
+            conditions_df.to_pickle(os.path.join(event_dir, f'conditions_{name}.pkl'))
+
+        corner_position_cleaned = telemetry_cleaning.clean_circuit_corner_data(session.get_circuit_info().corners)
+        if safety_car_laps is not None and event in safety_car_laps:
+            event_safety_car_laps = safety_car_laps[event]
+        else:
+            event_safety_car_laps = f1_pandas_helpers.get_safety_car_laps(session.laps)
+
+        event_drivers = drivers if drivers is not None else session.laps['Driver'].unique().tolist()
+
+        for driver in event_drivers:
+            feature_rows = []
+            telemetry_rows = []
+            chunk_index = 0
+
+            archive_writer = None
+            if archive_raw_telemetry:
+                archive_writer = telemetry_codec.TelemetryArchiveWriter(os.path.join(event_dir, f'{driver}_raw.f1tc'))
+
+            lap_stream = telemetry_processing.iter_driver_corner_features(
+                session, driver, event_safety_car_laps, corner_position_cleaned,
+                critical_turn, radius, start, end, archive_writer=archive_writer
+            )
+
+            # the archive footer is written on close, so close it even if the lap stream fails
+            try:
+                for lap_number, corner_telemetry, feature_row_df in lap_stream:
+                    feature_rows.append(feature_row_df)
+                    if spill_telemetry:
+                        telemetry_rows.append(corner_telemetry)
+
+                    if len(feature_rows) >= chunk_size:
+                        spilled_paths.append(_spill_chunk(event_dir, driver, chunk_index, feature_rows, telemetry_rows))
+                        feature_rows, telemetry_rows = [], []
+                        chunk_index += 1
+
+                if feature_rows:
+                    spilled_paths.append(_spill_chunk(event_dir, driver, chunk_index, feature_rows, telemetry_rows))
+            finally:
+                if archive_writer is not None:
+                    archive_writer.close()
+
+        # release the session (and its telemetry) so the prefetch queue stays the only resident copy
+        del session
+        gc.collect()
+
+    with open(manifest_path, 'w') as f:
+        json.dump({
+            'sessions': session_dirs,
+            'features': [os.path.relpath(path, spill_dir) for path in spilled_paths],
+        }, f, indent=2)
+
+    return spilled_paths
+
+def iter_spilled_features(spill_dir, with_keys=False):
+    """
+    Yields the feature chunks listed in spill_dir's manifest one at a time.
+    With with_keys=True, adds Year/Event/Session columns taken from the spill directory name.
+    """
+    for rel_path in _read_manifest(spill_dir)['features']:
+        path = os.path.join(spill_dir, rel_path)
+        chunk = pd.read_pickle(path)
+        if with_keys:
+            year, event, session_type = os.path.basename(os.path.dirname(path)).split('__')
+            chunk = chunk.assign(Year=int(year), Event=event, Session=session_type)
+        yield chunk
+
+def load_spilled_features(spill_dir, with_keys=False):
+    """
+    Returns all spilled feature chunks concatenated into one feature DataFrame.
+    """
+    chunks = list(iter_spilled_features(spill_dir, with_keys=with_keys))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+def load_spilled_conditions(spill_dir):
+    """
+    Returns (laps_df, weather_df, track_status_df) for every session in spill_dir's manifest,
+    ready for session_conditions.join_lap_conditions with load_spilled_features(with_keys=True).
+    """
+    session_dirs = _read_manifest(spill_dir)['sessions']
+    tables = []
+    for name in CONDITION_TABLES:
+        paths = [os.path.join(spill_dir, session_dir, f'conditions_{name}.pkl') for session_dir in session_dirs]
+        tables.append(pd.concat([pd.read_pickle(path) for path in paths], ignore_index=True) if paths else pd.DataFrame())
+    return tuple(tables)
+
+def _read_manifest(spill_dir):
+    """
+    Returns the manifest written by the last completed process_season_out_of_core run.
+    """
+    manifest_path = os.path.join(spill_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No completed run in {spill_dir}: {MANIFEST_NAME} is missing")
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def _session_dir_name(year, event, session_type):
+    """
+    Returns the spill sub-directory name for a session, e.g. '2025__Bahrain Grand Prix__R'.
+    """
+    return f'{year}__{event}__{session_type}'
+
+def _spill_chunk(event_dir, driver, chunk_index, feature_rows, telemetry_rows):
+    """
+    Writes one chunk of feature rows (and optional corner telemetry) to disk.
+    Returns the feature chunk path.
+    """
+    features_path = os.path.join(event_dir, f'{driver}_features_{chunk_index:04d}.pkl')
+    pd.concat(feature_rows, ignore_index=True).to_pickle(features_path)
+
+    if telemetry_rows:
+        telemetry_path = os.path.join(event_dir, f'{driver}_telemetry_{chunk_index:04d}.pkl')
+        pd.concat(telemetry_rows, ignore_index=True).to_pickle(telemetry_path)
+
+    return features_path
@@ -0,0 +1,108 @@
+import pandas as pd
+
+KEY_COLUMNS = ['Year', 'Event', 'Session']
+WEATHER_COLUMNS = ['AirTemp', 'TrackTemp', 'Humidity', 'Rainfall']
+
+def get_session_conditions(sessions):
+    """
+    Collects lap timing, weather and track status for many sessions into three tables,
+    each tagged with Year/Event/Session key columns.
+
+    Parameters:
+        sessions: iterable of ((year, event, session_type), session) pairs,
+                  e.g. the output of f1_data.prefetch_sessions
+
+    Returns:
+        laps_df: Driver, LapNumber and ConditionTime (lap midpoint in session time)
+        weather_df: session weather samples with Time
+        track_status_df: track status changes with Time and numeric TrackStatus
+    """
+    laps_list, weather_list, track_status_list = [], [], []
+
+    for (year, event, session_type), session in sessions:
+        keys = {'Year': year, 'Event': event, 'Session': session_type}
+        laps_list.append(get_lap_condition_times(session.laps).assign(**keys))
+        weather_list.append(session.get_weather_data().assign(**keys))
+        track_status = session.get_track_status()[['Time', 'Status']].rename(columns={'Status': 'TrackStatus'})
+        track_status_list.append(track_status.assign(**keys))
+
+    return (
+        pd.concat(laps_list, ignore_index=True),
+        pd.concat(weather_list, ignore_index=True),
+        pd.concat(track_status_list, ignore_index=True),
+    )
+
+def get_lap_condition_times(laps):
+    """
+    Returns Driver, LapNumber and ConditionTime (session time halfway through the lap,
+    falling back to the lap end time) for a FastF1 Laps object.
+    """
+    lap_end = laps['Time']
+    lap_mid = laps['LapStartTime'] + (lap_end - laps['LapStartTime']) / 2
+    return pd.DataFrame({
+        'Driver': laps['Driver'].to_numpy(),
+        'LapNumber': laps['LapNumber'].astype(int).to_numpy(),
+        'ConditionTime': lap_mid.fillna(lap_end).to_numpy(),
+    })
+
+def join_lap_conditions(feature_df, laps_df, weather_df, track_status_df=None,
+                        weather_cols=WEATHER_COLUMNS, keep_keys=False):
+    """
+    Attaches weather (and track status) to every row of a feature table in one pass.
+
+    Rows are matched to their lap's ConditionTime on (session keys, Driver, LapNumber), then
+    a single merge_asof per condition table picks the latest sample at or before that time,
+    grouped by session keys, so all drivers and sessions are joined without a Python loop.
+
+    Parameters:
+        feature_df: per-lap features with Driver and LapNumber, e.g. the feature table from
+                    process_driver_telemetry or iter_driver_corner_features (plus Year/Event/Session
+                    when the condition tables span several sessions, e.g.
+                    load_spilled_features(with_keys=True); raises ValueError if they're missing)
+        laps_df, weather_df, track_status_df: output of get_session_conditions
+        weather_cols: weather columns to attach
+        keep_keys: keep ConditionTime in the result; LapNumber and the session key columns are
+                   always kept so rows stay identifiable (perform_hdbscan_clustering drops them)
+
+    Returns:
+        pd.DataFrame with the feature rows (original order) plus condition columns
+    """
+    key_cols = [col for col in KEY_COLUMNS if col in feature_df.columns and col in laps_df.columns]
+    lap_keys = key_cols + ['Driver', 'LapNumber']
+
+    # without session keys, lap numbers and session times from different sessions would collide
+    laps_session_cols = [col for col in KEY_COLUMNS if col in laps_df.columns]
+    if not key_cols and laps_session_cols and len(laps_df[laps_session_cols].drop_duplicates()) > 1:
+        raise ValueError(
+            "laps_df covers several sessions but feature_df has no Year/Event/Session columns; "
+            "use load_spilled_features(with_keys=True) or filter the condition tables to one session"
+        )
+
+    joined = feature_df.reset_index(drop=True).assign(_row=lambda df: range(len(df)))
+    joined['LapNumber'] = joined['LapNumber'].astype(int)
+    joined = joined.merge(laps_df[lap_keys + ['ConditionTime']].drop_duplicates(lap_keys), on=lap_keys, how='left')
+
+    # merge_asof needs both sides sorted on the time key; rows without a lap time keep NaN conditions
+    timed = joined[joined['ConditionTime'].notna()].sort_values('ConditionTime')
+    untimed = joined[joined['ConditionTime'].isna()]
+
+    weather = weather_df[key_cols + ['Time'] + list(weather_cols)].sort_values('Time')
+    timed = pd.merge_asof(
+        timed, weather, left_on='ConditionTime', right_on='Time',
+        by=key_cols or None, direction='backward'
+    ).drop(columns=['Time'])
+
+    if track_status_df is not None:
+        track_status = track_status_df[key_cols + ['Time', 'TrackStatus']].sort_values('Time')
+        track_status = track_status.assign(TrackStatus=pd.to_numeric(track_status['TrackStatus'], errors='coerce'))
+        timed = pd.merge_asof(
+            timed, track_status, left_on='ConditionTime', right_on='Time',
+            by=key_cols or None, direction='backward'
+        ).drop(columns=['Time'])
+
+    joined = pd.concat([timed, untimed], ignore_index=True).sort_values('_row').drop(columns=['_row'])
+
+    if not keep_keys:
+        joined = joined.drop(columns=['ConditionTime'])
+
+    return joined.reset_index(drop=True)
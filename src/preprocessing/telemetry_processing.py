@@ -1,8 +1,13 @@
 import pandas as pd
 from src.utils import f1_pandas_helpers
+from src.utils.lap_cache import LapTelemetryCache, get_session_key
+from src.utils.result_cache import result_cache
 from src.preprocessing import telemetry_cleaning, feature_engineering
 
-def process_driver_telemetry(session, driver, safety_car_laps, corner_position_cleaned, critical_turn, radius, start, end):
+# processed per-lap telemetry shared by process_driver_telemetry and the lap query functions
+lap_cache = LapTelemetryCache()
+
+def process_driver_telemetry(session, driver, safety_car_laps, corner_position_cleaned, critical_turn, radius, start, end, cache=None, use_cache=True):
     """
     Processes a single driver's telemetry to extract corner features, performance metrics, and EDA stats.
 
@@ -13,12 +18,17 @@ def process_driver_telemetry(session, driver, safety_car_laps, corner_position_c
         corner_position_cleaned: tuple/list with corner coordinates
         critical_turn: list/tuple with turn number(s)
         radius: radius around turn to isolate corner telemetry
+        cache: LapTelemetryCache to store processed laps in (defaults to the module lap_cache)
+        use_cache: reuse results from the on-disk result_cache when inputs are unchanged
 
     Returns:
         final_feature_df: pd.DataFrame containing combined EDA stats and performance metrics
         driver_laps_filtered:
         sector_timestamps_dict: dictionary of lap numbers and their sector timestamps
     """
+    cache = lap_cache if cache is None else cache
+    session_key = get_session_key(session)
+
     # pick laps for driver
     driver_laps = session.laps.pick_drivers(driver)
     driver_laps_filtered = f1_pandas_helpers.filter_driver_lap_data(driver_laps, safety_car_laps)
@@ -26,17 +36,50 @@ def process_driver_telemetry(session, driver, safety_car_laps, corner_position_c
     # get sector timestamps
     sector_timestamps_dict = f1_pandas_helpers.get_valid_lap_sector_timestamps(driver_laps_filtered)
 
+    # load, clean and sector-filter telemetry (cached on the laps, not on turn/radius)
+    sector_lap_numbers, sector_telemetry_list = _load_sector_telemetry(
+        driver_laps_filtered, driver, sector_timestamps_dict, start, end, use_cache=use_cache
+    )
+
+    # filter sector telemetry points that fall within the corner radius
+    if (critical_turn != None) and radius > 0:
+        final_feature_df, corner_telemetry_enriched_list, performance_metrics_list = _build_corner_features(
+            sector_telemetry_list, sector_lap_numbers, corner_position_cleaned, critical_turn, radius, driver, use_cache=use_cache
+        )
+
+        # keep processed laps for the fastest/best/single lap queries
+        for lap_number, corner_df, metrics in zip(sector_lap_numbers, corner_telemetry_enriched_list, performance_metrics_list):
+            key = cache.make_key(session_key, driver, lap_number, start, end, critical_turn, radius)
+            cache.put(key, {'telemetry': corner_df, 'metrics': metrics})
+
+        return final_feature_df, driver_laps_filtered, sector_timestamps_dict
+    
+    else:
+        for lap_number, sector_df in zip(sector_lap_numbers, sector_telemetry_list):
+            key = cache.make_key(session_key, driver, lap_number, start, end, critical_turn, radius)
+            cache.put(key, {'telemetry': sector_df, 'metrics': None})
+
+        return sector_telemetry_list, driver_laps_filtered, sector_timestamps_dict
+
+@result_cache.memoize('sector_telemetry', depends_on=(telemetry_cleaning, f1_pandas_helpers))
+def _load_sector_telemetry(driver_laps_filtered, driver, sector_timestamps_dict, start, end):
+    """
+    Loads, cleans and sector-filters telemetry for every valid lap of a driver.
+    Returns (lap_numbers, sector_telemetry_list) with plain DataFrames so results pickle
+    without the FastF1 session attached.
+    """
     # get telemetry for all valid laps
     driver_telemetry = f1_pandas_helpers.get_valid_lap_telemetry(driver_laps_filtered)
 
     # clean telemetry for each lap
     driver_telemetry_cleaned_list = [
-        telemetry_cleaning.clean_driver_telemetry(lap_telemetry, driver)
+        pd.DataFrame(telemetry_cleaning.clean_driver_telemetry(lap_telemetry, driver))
         for lap_telemetry in driver_telemetry
     ]
 
     # filter cleaned telemetry down to sector timeframe
     sector_telemetry_list = []
+    sector_lap_numbers = []
     for lap_df in driver_telemetry_cleaned_list:
         lap_number = lap_df['LapNumber'].iloc[0]
         if lap_number in sector_timestamps_dict.keys():
@@ -50,59 +93,230 @@ def process_driver_telemetry(session, driver, safety_car_laps, corner_position_c
                 timestamp_col='SessionTime (s)'
             )
             sector_telemetry_list.append(sector_telemetry)
+            sector_lap_numbers.append(lap_number)
 
-    # filter sector telemetry points that fall within the corner radius
-    if (critical_turn != None) and radius > 0:
-        corner_telemetry_list = [
-            telemetry_cleaning.filter_corner_telemetry(
-                sector_df,
-                corner_position_cleaned,
-                critical_turn,
-                radius
-            )
+    return sector_lap_numbers, sector_telemetry_list
+
+@result_cache.memoize('corner_features', depends_on=(telemetry_cleaning, feature_engineering, f1_pandas_helpers))
+def _build_corner_features(sector_telemetry_list, lap_numbers, corner_position_cleaned, critical_turn, radius, driver):
+    """
+    Isolates each lap's corner telemetry, runs the TelemetryFeatures chain and builds the
+    per-lap feature table.
+    Returns (final_feature_df, corner_telemetry_enriched_list, performance_metrics_list).
+    """
+    corner_telemetry_list = [
+        telemetry_cleaning.filter_corner_telemetry(
+            sector_df,
+            corner_position_cleaned,
+            critical_turn,
+            radius
+        )
+        for sector_df in sector_telemetry_list
+    ]
+
+    return _corner_feature_table(corner_telemetry_list, lap_numbers, critical_turn, driver)
+
+def _corner_feature_table(corner_telemetry_list, lap_numbers, critical_turn, driver):
+    """
+    Runs the TelemetryFeatures chain on corner-isolated laps and combines EDA stats with
+    performance metrics into one row per lap, identified by Driver, Turn and LapNumber.
+    Returns (final_feature_df, corner_telemetry_enriched_list, performance_metrics_list).
+    """
+    # derive features for each corner-isolated dataframe
+    corner_telemetry_enriched_list = [
+        _derive_corner_features(corner_df)
+        for corner_df in corner_telemetry_list
+    ]
+
+    # generate performance metrics
+    performance_metrics_list = [
+        feature_engineering.TelemetryFeatures.generate_telemetry_performance_metrics(corner_df)
+        for corner_df in corner_telemetry_enriched_list
+    ]
+    
+    performance_metrics_df = pd.DataFrame(performance_metrics_list)
+
+    # calculate EDA stats
+    eda_summary_list = [
+        f1_pandas_helpers.get_driver_eda_stats(
+            df=corner_df,
+            driver=driver,
+            critical_turn=critical_turn
+        )
+        for corner_df in corner_telemetry_enriched_list
+    ]
+    eda_summary_df = pd.concat(eda_summary_list, ignore_index=True)
+    eda_summary_df.insert(2, 'LapNumber', [int(lap_number) for lap_number in lap_numbers])
+
+    # combine EDA stats with performance metrics
+    final_feature_df = pd.concat([eda_summary_df, performance_metrics_df.reset_index(drop=True)], axis=1)
+
+    return final_feature_df, corner_telemetry_enriched_list, performance_metrics_list
+
+
+
+def iter_driver_corner_features(session, driver, safety_car_laps, corner_position_cleaned, critical_turn, radius, start, end, archive_writer=None):
+    """
+    Streaming version of process_driver_telemetry: laps flow one at a time through
+    cleaning, sector/corner filtering and feature derivation, so peak memory is a single lap.
+    Laps with no telemetry inside the corner radius are skipped.
+
+    Parameters match process_driver_telemetry, plus:
+        archive_writer: optional telemetry_codec.TelemetryArchiveWriter that receives each
+                        raw lap (with its sector timestamps) before cleaning
+
+    Yields:
+        (lap_number, corner_telemetry_enriched, feature_row_df) for each valid lap
+    """
+    driver_laps = session.laps.pick_drivers(driver)
+    driver_laps_filtered = f1_pandas_helpers.filter_driver_lap_data(driver_laps, safety_car_laps)
+    sector_timestamps_dict = f1_pandas_helpers.get_valid_lap_sector_timestamps(driver_laps_filtered)
+
+    for lap_telemetry in f1_pandas_helpers.iter_valid_lap_telemetry(driver_laps_filtered):
+        lap_number = lap_telemetry['LapNumber'].iloc[0]
+        if lap_number not in sector_timestamps_dict.keys():
+            continue
+
+        if archive_writer is not None:
+            archive_writer.write_lap(lap_number, lap_telemetry, sector_timestamps_dict[lap_number])
+
+        lap_df = pd.DataFrame(telemetry_cleaning.clean_driver_telemetry(lap_telemetry, driver))
+
+        sector_telemetry = f1_pandas_helpers.filter_timestamp_range(
+            lap_df,
+            start=sector_timestamps_dict[lap_number][start],
+            end=sector_timestamps_dict[lap_number][end],
+            timestamp_col='SessionTime (s)'
+        )
+
+        corner_telemetry = telemetry_cleaning.filter_corner_telemetry(
+            sector_telemetry,
+            corner_position_cleaned,
+            critical_turn,
+            radius
+        )
+        if corner_telemetry.empty:
+            continue
+
+        feature_row_df, corner_telemetry_enriched_list, _ = _corner_feature_table([corner_telemetry], [lap_number], critical_turn, driver)
+
+        yield lap_number, corner_telemetry_enriched_list[0], feature_row_df
+
+
+
+def sweep_corner_parameters(session, drivers, safety_car_laps, corner_position_cleaned, turns, radii, start, end, use_cache=True):
+    """
+    Builds corner feature tables for every (turn, radius) combination while loading and
+    cleaning each driver's telemetry only once.
+
+    Each sample's distance to every corner is computed once per lap, so each grid point
+    is a threshold on that distance matrix instead of a rerun of process_driver_telemetry.
+    Laps with no telemetry inside a given radius are skipped for that grid point.
+
+    Parameters:
+        session: FastF1 session object
+        drivers: driver code or list of driver codes
+        safety_car_laps: list of lap numbers to exclude
+        corner_position_cleaned: pd.DataFrame from clean_circuit_corner_data
+        turns: list of turn numbers to evaluate
+        radii: list of radii (1/10 m) to evaluate
+        start, end: sector timestamp keys, as in process_driver_telemetry
+        use_cache: reuse the on-disk sector telemetry stage
+
+    Returns:
+        dict mapping (turn, radius) to a pd.DataFrame of per-lap features for all drivers
+    """
+    if isinstance(drivers, str):
+        drivers = [drivers]
+
+    turn_positions = corner_position_cleaned.drop_duplicates('Turn').set_index('Turn').loc[list(turns), ['X (1/10 m)', 'Y (1/10 m)']].to_numpy(dtype=float)
+
+    feature_tables = {(turn, radius): [] for turn in turns for radius in radii}
+
+    for driver in drivers:
+        driver_laps = session.laps.pick_drivers(driver)
+        driver_laps_filtered = f1_pandas_helpers.filter_driver_lap_data(driver_laps, safety_car_laps)
+        sector_timestamps_dict = f1_pandas_helpers.get_valid_lap_sector_timestamps(driver_laps_filtered)
+
+        sector_lap_numbers, sector_telemetry_list = _load_sector_telemetry(
+            driver_laps_filtered, driver, sector_timestamps_dict, start, end, use_cache=use_cache
+        )
+
+        # squared distance of every sample to every corner, shape (samples, turns)
+        squared_distances_list = [
+            (sector_df['X (1/10 m)'].to_numpy(dtype=float)[:, None] - turn_positions[:, 0])**2
+            + (sector_df['Y (1/10 m)'].to_numpy(dtype=float)[:, None] - turn_positions[:, 1])**2
             for sector_df in sector_telemetry_list
         ]
 
-        # derive features for each corner-isolated dataframe
-        corner_telemetry_enriched_list = [
-            feature_engineering.TelemetryFeatures(corner_df)
-            .acceleration()
-            .g_force()
-            .convert_sector_time_to_seconds()
-            .get_features_df()
-            for corner_df in corner_telemetry_list
-        ]
+        for turn_index, turn in enumerate(turns):
+            for radius in radii:
+                corner_telemetry_list = []
+                corner_lap_numbers = []
+                for lap_number, sector_df, squared_distances in zip(sector_lap_numbers, sector_telemetry_list, squared_distances_list):
+                    corner_df = sector_df[squared_distances[:, turn_index] <= radius**2]
+                    if not corner_df.empty:
+                        corner_telemetry_list.append(corner_df)
+                        corner_lap_numbers.append(lap_number)
 
-        # generate performance metrics
-        performance_metrics_list = [
-            feature_engineering.TelemetryFeatures.generate_telemetry_performance_metrics(corner_df)
-            for corner_df in corner_telemetry_enriched_list
-        ]
-        
-        performance_metrics_df = pd.DataFrame(performance_metrics_list)
-
-        # calculate EDA stats
-        eda_summary_list = [
-            f1_pandas_helpers.get_driver_eda_stats(
-                df=corner_df,
-                driver=driver,
-                critical_turn=critical_turn
-            )
-            for corner_df in corner_telemetry_enriched_list
-        ]
-        eda_summary_df = pd.concat(eda_summary_list, ignore_index=True)
+                if corner_telemetry_list:
+                    final_feature_df, _, _ = _corner_feature_table(corner_telemetry_list, corner_lap_numbers, turn, driver)
+                    feature_tables[(turn, radius)].append(final_feature_df)
+
+    return {
+        key: pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+        for key, tables in feature_tables.items()
+    }
 
-        # combine EDA stats with performance metrics
-        final_feature_df = pd.concat([eda_summary_df, performance_metrics_df.reset_index(drop=True)], axis=1)
 
-        return final_feature_df, driver_laps_filtered, sector_timestamps_dict
-    
-    else:
-        return sector_telemetry_list, driver_laps_filtered, sector_timestamps_dict
 
+def get_lap_telemetry(processed_driver_data, driver_code, lap_number, corner_position, critical_turn, radius, start, end, cache=None):
+    """
+    Returns corner-isolated (or sector) telemetry for any single lap of a driver.
+    Served from the lap cache when process_driver_telemetry has already processed the lap,
+    otherwise the lap is processed once and cached.
+
+    Parameters:
+        processed_driver_data: tuple
+            Output from the driver preprocessing function: (final_feature_df, driver_laps_filtered, sector_timestamps_dict)
+        driver_code: str
+            Driver code (e.g., 'NOR', 'VER')
+        lap_number: int
+            Lap to return telemetry for
+        corner_position, critical_turn, radius, start, end:
+            Same as get_fastest_lap_telemetry
+        cache: LapTelemetryCache (defaults to the module lap_cache)
+
+    Returns:
+        pd.DataFrame with telemetry for the requested lap
+    """
+    cache = lap_cache if cache is None else cache
+    _, driver_laps_filtered, sector_timestamps_dict = processed_driver_data
+    session_key = get_session_key(getattr(driver_laps_filtered, 'session', None))
+
+    key = cache.make_key(session_key, driver_code, lap_number, start, end, critical_turn, radius)
+    entry = cache.get(key)
+    if entry is None:
+        lap = driver_laps_filtered.loc[driver_laps_filtered['LapNumber'] == int(lap_number)].iloc[0]
+        entry = _process_single_lap(lap, driver_code, sector_timestamps_dict, corner_position, critical_turn, radius, start, end)
+        cache.put(key, entry)
+
+    return entry['telemetry'].copy()
+
+def get_best_laps_telemetry(processed_driver_data, driver_code, n, corner_position, critical_turn, radius, start, end, cache=None):
+    """
+    Returns a list of telemetry dataframes for a driver's n fastest valid laps, fastest first.
+    Parameters match get_lap_telemetry.
+    """
+    _, driver_laps_filtered, _ = processed_driver_data
+    best_laps = driver_laps_filtered.dropna(subset=['LapTime']).sort_values('LapTime').head(n)
 
+    return [
+        get_lap_telemetry(processed_driver_data, driver_code, lap_number, corner_position, critical_turn, radius, start, end, cache)
+        for lap_number in best_laps['LapNumber']
+    ]
 
-def get_fastest_lap_telemetry(processed_driver_data, driver_code, corner_position, critical_turn, radius, start, end):
+def get_fastest_lap_telemetry(processed_driver_data, driver_code, corner_position, critical_turn, radius, start, end, cache=None):
     """
     Extracts corner-isolated telemetry for the fastest lap of a driver.
     
@@ -121,32 +335,39 @@ def get_fastest_lap_telemetry(processed_driver_data, driver_code, corner_positio
             Key name for sector1 end / sector2 start timestamp in sector dict
         s2_end_s3_start: str
             Key name for sector2 end / sector3 start timestamp in sector dict
+        cache: LapTelemetryCache (defaults to the module lap_cache)
 
     Returns:
         corner_telemetry_enriched: if critical_turn required get Telemetry df filtered to the corner for the fastest lap
         sector_telemetry: if critical_turn not required, get Telemetry df for the fastest lap
     """
-    # unpack processed data
-    if (critical_turn != None) and radius > 0:
-        _, driver_laps_filtered, sector_timestamps_dict = processed_driver_data
-    else:
-        _, driver_laps_filtered, sector_timestamps_dict = processed_driver_data
+    _, driver_laps_filtered, _ = processed_driver_data
+
+    # get fastest lap number
+    fastest_lap_number = driver_laps_filtered.loc[driver_laps_filtered['LapTime'].idxmin(), 'LapNumber']
 
-    # get fastest lap row
-    fastest_lap_idx = driver_laps_filtered.loc[driver_laps_filtered['LapTime'].idxmin()]
-    fastest_telemetry = fastest_lap_idx.get_telemetry()
+    return get_lap_telemetry(processed_driver_data, driver_code, fastest_lap_number, corner_position, critical_turn, radius, start, end, cache)
+
+def _process_single_lap(lap, driver_code, sector_timestamps_dict, corner_position, critical_turn, radius, start, end):
+    """
+    Runs clean -> sector filter -> corner filter -> features for one FastF1 Lap.
+    Returns a lap cache entry dict with 'telemetry' and 'metrics'.
+    """
+    # build the lap frame the same way as iter_valid_lap_telemetry so cache hits and misses
+    # return the same columns in the same order
+    lap_telemetry = lap.get_telemetry().copy()
+    lap_telemetry['LapNumber'] = lap.LapNumber
 
     # clean telemetry
-    fastest_telemetry_cleaned = telemetry_cleaning.clean_driver_telemetry(fastest_telemetry, driver_code)
+    lap_telemetry_cleaned = pd.DataFrame(telemetry_cleaning.clean_driver_telemetry(lap_telemetry, driver_code))
 
     # get sector start and end timestamps
-    fastest_lap_number = fastest_lap_idx['LapNumber']
-    sector_start = sector_timestamps_dict[fastest_lap_number][start]
-    sector_end = sector_timestamps_dict[fastest_lap_number][end]
+    sector_start = sector_timestamps_dict[lap['LapNumber']][start]
+    sector_end = sector_timestamps_dict[lap['LapNumber']][end]
 
     # filter telemetry by sector timestamps
     sector_telemetry = f1_pandas_helpers.filter_timestamp_range(
-        fastest_telemetry_cleaned,
+        lap_telemetry_cleaned,
         start=sector_start,
         end=sector_end,
         timestamp_col='SessionTime (s)'
@@ -161,19 +382,21 @@ def get_fastest_lap_telemetry(processed_driver_data, driver_code, corner_positio
             radius
         )
 
-        # derive features
-        corner_telemetry_enriched = (
-            feature_engineering.TelemetryFeatures(corner_telemetry)
-            .acceleration()
-            .g_force()
-            .convert_sector_time_to_seconds()
-            .get_features_df()
-        )
+        corner_telemetry_enriched = _derive_corner_features(corner_telemetry)
+        metrics = feature_engineering.TelemetryFeatures.generate_telemetry_performance_metrics(corner_telemetry_enriched)
 
-        return corner_telemetry_enriched
-    
-    else:
-        # add fastest lap number to the fastest lap telemetry df
-        sector_telemetry = sector_telemetry.copy()
-        sector_telemetry['LapNumber'] = fastest_lap_number
-        return sector_telemetry
\ No newline at end of file
+        return {'telemetry': corner_telemetry_enriched, 'metrics': metrics}
+
+    return {'telemetry': sector_telemetry, 'metrics': None}
+
+def _derive_corner_features(corner_df):
+    """
+    Applies the standard TelemetryFeatures chain to corner-isolated telemetry.
+    """
+    return (
+        feature_engineering.TelemetryFeatures(corner_df)
+        .acceleration()
+        .g_force()
+        .convert_sector_time_to_seconds()
+        .get_features_df()
+    )
@@ -29,6 +29,35 @@ class F1Constants:
         "Miami": "Miami"      
     }
 
+    # FastF1 EventName for each location, as used in session keys and season spill directories
+    EVENT_NAMES = {
+        "Bahrain": "Bahrain Grand Prix",
+        "Australia": "Australian Grand Prix",
+        "China": "Chinese Grand Prix",
+        "Japan": "Japanese Grand Prix",
+        "Saudi Arabia": "Saudi Arabian Grand Prix",
+        "Austin": "United States Grand Prix",
+        "Italy": "Italian Grand Prix",
+        "Monaco": "Monaco Grand Prix",
+        "Spain": "Spanish Grand Prix",
+        "Canada": "Canadian Grand Prix",
+        "Austria": "Austrian Grand Prix",
+        "United Kingdom": "British Grand Prix",
+        "Belgium": "Belgian Grand Prix",
+        "Hungary": "Hungarian Grand Prix",
+        "Netherlands": "Dutch Grand Prix",
+        "Azerbaijan": "Azerbaijan Grand Prix",
+        "Singapore": "Singapore Grand Prix",
+        "Mexico": "Mexico City Grand Prix",
+        "Brazil": "São Paulo Grand Prix",
+        "Las Vegas": "Las Vegas Grand Prix",
+        "Qatar": "Qatar Grand Prix",
+        "Abu Dhabi": "Abu Dhabi Grand Prix",
+        "France": "French Grand Prix",
+        "Portugal": "Portuguese Grand Prix",
+        "Miami": "Miami Grand Prix"
+    }
+
     SESSIONS = {
         "FP1": "FP1",
         "FP2": "FP2",
@@ -78,5 +107,10 @@ class F1Constants:
         'Throttle (%)': 'Throttle (%)',
         'BrakesApplied': 'BrakesApplied',
         'RPM': 'RPM',
-        'Steering Wheel Angle (°)': 'Steering Wheel Angle (°)'
+        'Steering Wheel Angle (°)': 'Steering Wheel Angle (°)',
+        'Heading (rad)': 'Heading (rad)',
+        'Yaw Rate (rad/s)': 'Yaw Rate (rad/s)',
+        'Curvature (1/m)': 'Curvature (1/m)',
+        'Lateral Acceleration (m/s²)': 'Lateral Acceleration (m/s²)',
+        'Lateral G-force (g)': 'Lateral G-force (g)'
     }
\ No newline at end of file
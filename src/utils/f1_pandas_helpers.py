@@ -36,14 +36,24 @@ def get_valid_lap_telemetry(df):
     """
     Returns list of telemetry dataframes for all valid laps for a single driver.
     """
-    all_telemetry_list = []
+    return list(iter_valid_lap_telemetry(df))
 
+def iter_valid_lap_telemetry(df):
+    """
+    Yields telemetry dataframes one valid lap at a time, so only a single lap is held in memory.
+    """
     for lap in df.iterlaps():
         telemetry = lap[1].get_telemetry().copy()
         telemetry['LapNumber'] = lap[1].LapNumber
-        all_telemetry_list.append(telemetry)
+        yield telemetry
 
-    return all_telemetry_list
+def get_safety_car_laps(laps):
+    """
+    Returns sorted list of lap numbers run under safety car, virtual safety car or red flag,
+    based on the FastF1 TrackStatus codes ('4' SC, '5' red flag, '6'/'7' VSC).
+    """
+    neutralised = laps['TrackStatus'].astype(str).str.contains('[4567]', regex=True)
+    return sorted(laps.loc[neutralised, 'LapNumber'].dropna().astype(int).unique().tolist())
 
 def get_valid_lap_sector_timestamps(laps):
     """
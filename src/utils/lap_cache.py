@@ -0,0 +1,69 @@
+# lap_cache.py
+from collections import OrderedDict
+
+class LapTelemetryCache:
+    """
+    Size-bounded LRU cache of processed per-lap telemetry.
+    Entries are keyed by (session, driver, lap, sector, turn, radius) so the fastest-lap,
+    best-N-laps and single-lap queries can reuse the work done by process_driver_telemetry.
+    """
+
+    def __init__(self, max_size: int=512):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(session_key, driver, lap_number, start, end, critical_turn, radius):
+        """
+        Returns a hashable cache key for a single processed lap.
+        """
+        if isinstance(critical_turn, (list, tuple)):
+            critical_turn = tuple(critical_turn)
+        return (session_key, driver, int(lap_number), start, end, critical_turn, radius)
+
+    def get(self, key):
+        """
+        Returns the cached entry for key (marking it most recently used), or None on a miss.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key]
+
+    def put(self, key, entry):
+        """
+        Stores entry under key, evicting the least recently used entries past max_size.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_session_key(session):
+    """
+    Returns a hashable identifier for a FastF1 session (year, event name, session name),
+    or None when the object carries no event metadata.
+    """
+    event = getattr(session, 'event', None)
+    if event is None:
+        return None
+    try:
+        return (int(event['EventDate'].year), event['EventName'], session.name)
+    except (KeyError, AttributeError, TypeError):
+        return None
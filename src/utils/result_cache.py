@@ -0,0 +1,195 @@
+# result_cache.py
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.utils.lap_cache import get_session_key
+
+# anchored at the repo root so notebooks (run from notebooks/) and scripts share one cache
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.environ.get('F1_RESULT_CACHE_DIR', os.path.join(REPO_ROOT, '.cache', 'results'))
+DEFAULT_MAX_BYTES = int(os.environ.get('F1_RESULT_CACHE_MAX_BYTES', 2 * 1024**3))
+
+def _update_hash(h, obj):
+    """
+    Feeds obj into hashlib object h. DataFrames/Series/arrays are hashed by content,
+    FastF1 sessions by (year, event, session) and containers recursively.
+    """
+    if isinstance(obj, pd.DataFrame):
+        h.update(b'df')
+        h.update(repr(list(obj.columns)).encode())
+        h.update(repr([str(dtype) for dtype in obj.dtypes]).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(pd.DataFrame(obj), index=True).values.tobytes())
+        except TypeError:
+            h.update(pickle.dumps(pd.DataFrame(obj), protocol=pickle.HIGHEST_PROTOCOL))
+    elif isinstance(obj, pd.Series):
+        h.update(b'series')
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(pd.Series(obj), index=True).values.tobytes())
+        except TypeError:
+            h.update(pickle.dumps(pd.Series(obj), protocol=pickle.HIGHEST_PROTOCOL))
+    elif isinstance(obj, np.ndarray):
+        h.update(b'ndarray')
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b'dict')
+        for key in sorted(obj, key=repr):
+            _update_hash(h, key)
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            _update_hash(h, item)
+    elif hasattr(obj, 'event') and hasattr(obj, 'laps'):
+        h.update(b'session')
+        h.update(repr(get_session_key(obj)).encode())
+    else:
+        h.update(repr(obj).encode())
+
+def hash_inputs(*args, **kwargs):
+    """
+    Returns a hex digest of positional and keyword arguments.
+    """
+    h = hashlib.sha256()
+    _update_hash(h, list(args))
+    _update_hash(h, kwargs)
+    return h.hexdigest()
+
+def code_version(*modules):
+    """
+    Returns a hex digest of the source of the given modules, so cached results are
+    invalidated when the code that produced them changes.
+    """
+    h = hashlib.sha256()
+    for module in modules:
+        try:
+            h.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):
+            h.update(module.__name__.encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Disk-backed memoization of expensive pipeline stages.
+    Results are pickled under cache_dir/<stage>/<key>.pkl where key hashes the stage inputs,
+    parameters and code version. Least recently used files are evicted once the cache
+    grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: str=DEFAULT_CACHE_DIR, max_bytes: int=DEFAULT_MAX_BYTES, enabled: bool=True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, f'{key}.pkl')
+
+    def get(self, stage, key):
+        """
+        Returns (True, result) on a hit, (False, None) on a miss.
+        """
+        path = self._path(stage, key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        # bump modification time so eviction is least recently used; another process may
+        # have evicted the file since it was read, which doesn't affect this hit
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, result
+
+    def put(self, stage, key, result):
+        """
+        Pickles result atomically, then evicts old entries past max_bytes.
+        """
+        stage_dir = os.path.join(self.cache_dir, stage)
+        os.makedirs(stage_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=stage_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(stage, key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Removes least recently used results until the cache fits within max_bytes.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self, stage: str=None):
+        """
+        Removes all cached results, or only those of one stage.
+        """
+        root_dir = os.path.join(self.cache_dir, stage) if stage else self.cache_dir
+        for root, _, files in os.walk(root_dir):
+            for name in files:
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(root, name))
+
+    def memoize(self, stage: str, depends_on=()):
+        """
+        Decorator caching a function's return value on disk.
+        The key covers the call arguments plus the source of the function's module and
+        any modules in depends_on. Pass use_cache=False to a decorated call to bypass it.
+        """
+        def decorator(func):
+            version = None
+
+            @functools.wraps(func)
+            def wrapper(*args, use_cache=True, **kwargs):
+                nonlocal version
+                if not (self.enabled and use_cache):
+                    return func(*args, **kwargs)
+
+                if version is None:
+                    version = code_version(sys.modules[func.__module__], *depends_on)
+                key = hash_inputs(version, func.__qualname__, *args, **kwargs)
+
+                hit, result = self.get(stage, key)
+                if hit:
+                    return result
+
+                result = func(*args, **kwargs)
+                self.put(stage, key, result)
+                return result
+
+            return wrapper
+        return decorator
+
+
+# shared cache used by the preprocessing and clustering stages
+result_cache = ResultCache()
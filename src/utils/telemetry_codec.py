@@ -0,0 +1,341 @@
+# telemetry_codec.py
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b'F1TC'
+VERSION = 1
+
+# quantization step per channel for delta coding (in the channel's own units)
+CHANNEL_SCALES = {
+    'Speed': 0.1,
+    'Speed (m/s)': 0.01,
+    'Speed (km/h)': 0.1,
+    'RPM': 1.0,
+    'Throttle': 1.0,
+    'Throttle (%)': 1.0,
+    'Distance': 0.01,
+    'Distance (m)': 0.01,
+    'RelativeDistance': 1e-6,
+    'DistanceToDriverAhead': 0.01,
+    'X': 1.0,
+    'Y': 1.0,
+    'Z': 1.0,
+    'X (1/10 m)': 1.0,
+    'Y (1/10 m)': 1.0,
+    'Z (1/10 m)': 1.0,
+}
+DEFAULT_FLOAT_SCALE = 1e-3
+
+# step-like channels stored as run-length encoded values
+RLE_CHANNELS = {'nGear', 'Brake', 'BrakesApplied', 'DRS'}
+
+# timestamps are quantized to milliseconds
+TIME_SCALE_NS = 1_000_000
+
+# ---------------------------------------------------------------------------
+# vectorized primitives
+
+def zigzag_encode(values):
+    """
+    Maps signed int64 to unsigned so small magnitudes stay small: 0,-1,1,-2 -> 0,1,2,3.
+    """
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+def zigzag_decode(values):
+    values = values.astype(np.uint64)
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64)
+
+def varint_encode(values):
+    """
+    LEB128-encodes an array of uint64 into bytes without a per-value Python loop.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b''
+    shifts = np.arange(10, dtype=np.uint64) * np.uint64(7)
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7F)).astype(np.uint8)
+
+    # byte count = index of the highest non-zero 7-bit group + 1 (zero still takes one byte)
+    n_bytes = np.where(values > 0, 10 - np.argmax(groups[:, ::-1] != 0, axis=1), 1)
+
+    positions = np.arange(10)
+    groups[positions < (n_bytes[:, None] - 1)] |= 0x80
+    return groups[positions < n_bytes[:, None]].tobytes()
+
+def varint_decode(buffer):
+    """
+    Decodes LEB128 bytes into an array of uint64 without a per-value Python loop.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) == 0:
+        return np.empty(0, dtype=np.uint64)
+    terminal = (data & 0x80) == 0
+    ends = np.flatnonzero(terminal)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    value_id = np.concatenate(([0], np.cumsum(terminal)[:-1]))
+    shift = (np.arange(len(data)) - starts[value_id]).astype(np.uint64) * np.uint64(7)
+    payload = (data & 0x7F).astype(np.uint64) << shift
+    return np.bitwise_or.reduceat(payload, starts)
+
+def rle_encode(values):
+    """
+    Returns (run_values, run_lengths) for a 1-D integer array.
+    """
+    if len(values) == 0:
+        return values[:0], np.empty(0, dtype=np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+    lengths = np.diff(np.append(starts, len(values)))
+    return values[starts], lengths
+
+def rle_decode(run_values, run_lengths):
+    return np.repeat(run_values, run_lengths)
+
+# ---------------------------------------------------------------------------
+# channel codecs
+
+def _encode_delta(quantized):
+    deltas = np.diff(quantized, prepend=np.int64(0))
+    return varint_encode(zigzag_encode(deltas))
+
+def _decode_delta(buffer):
+    return np.cumsum(zigzag_decode(varint_decode(buffer)))
+
+def _encode_rle(codes):
+    run_values, run_lengths = rle_encode(codes.astype(np.int64))
+    return varint_encode(zigzag_encode(run_values)), varint_encode(run_lengths.astype(np.uint64))
+
+def _decode_rle(values_buffer, lengths_buffer):
+    return rle_decode(zigzag_decode(varint_decode(values_buffer)), varint_decode(lengths_buffer).astype(np.int64))
+
+def encode_channel(name, series):
+    """
+    Encodes one telemetry column. Returns (spec dict, list of byte segments).
+    Numeric channels are quantized and delta coded, step-like channels, booleans and strings
+    are run-length encoded, and timestamps are millisecond deltas. NaNs are stored as an
+    RLE mask.
+    """
+    dtype = series.dtype
+    spec = {'name': name, 'dtype': str(dtype)}
+
+    if pd.api.types.is_timedelta64_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        raw = series.dt.as_unit('ns').array.asi8
+        nan_mask = series.isna().to_numpy()
+        spec['encoding'] = 'time'
+        quantized = np.round(raw / TIME_SCALE_NS).astype(np.int64)
+        segments = [_encode_delta(np.where(nan_mask, 0, quantized))]
+
+    elif pd.api.types.is_bool_dtype(dtype) or (name in RLE_CHANNELS and pd.api.types.is_numeric_dtype(dtype)):
+        values = series.to_numpy()
+        nan_mask = pd.isna(values) if not pd.api.types.is_bool_dtype(dtype) else np.zeros(len(values), dtype=bool)
+        spec['encoding'] = 'rle'
+        segments = list(_encode_rle(np.where(nan_mask, 0, values).astype(np.int64)))
+
+    elif pd.api.types.is_numeric_dtype(dtype):
+        values = series.to_numpy(dtype=np.float64)
+        nan_mask = np.isnan(values)
+        scale = CHANNEL_SCALES.get(name, 1.0 if pd.api.types.is_integer_dtype(dtype) else DEFAULT_FLOAT_SCALE)
+        spec['encoding'] = 'delta'
+        spec['scale'] = scale
+        quantized = np.round(np.where(nan_mask, 0, values) / scale).astype(np.int64)
+        segments = [_encode_delta(quantized)]
+
+    else:
+        codes, categories = pd.factorize(series, use_na_sentinel=True)
+        nan_mask = codes < 0
+        spec['encoding'] = 'category'
+        spec['categories'] = [str(category) for category in categories]
+        segments = list(_encode_rle(np.where(nan_mask, 0, codes)))
+
+    if nan_mask.any():
+        spec['has_nan'] = True
+        segments += list(_encode_rle(nan_mask.astype(np.int64)))
+
+    return spec, segments
+
+def decode_channel(spec, segments):
+    """
+    Inverse of encode_channel. Returns a numpy array (or a pd.Series for pandas-only dtypes
+    such as strings and tz-aware timestamps).
+    """
+    encoding = spec['encoding']
+    dtype = spec['dtype']
+
+    if encoding == 'time':
+        values = (_decode_delta(segments[0]) * TIME_SCALE_NS).view('m8[ns]' if dtype.startswith('timedelta') else 'M8[ns]')
+        missing = values.dtype.type('NaT')
+        rest = segments[1:]
+    elif encoding == 'delta':
+        values = _decode_delta(segments[0]) * spec['scale']
+        if _is_numpy_dtype(dtype) and np.dtype(dtype).kind in 'iub':
+            values = np.round(values)
+        missing = np.nan
+        rest = segments[1:]
+    elif encoding == 'rle':
+        values = _decode_rle(segments[0], segments[1])
+        missing = np.nan
+        rest = segments[2:]
+    else:
+        categories = np.asarray(spec['categories'] or [None], dtype=object)
+        values = categories[_decode_rle(segments[0], segments[1])]
+        missing = None
+        rest = segments[2:]
+
+    if spec.get('has_nan'):
+        # columns holding NaN were float/object/datetime originally, so dtype can hold it
+        nan_mask = _decode_rle(rest[0], rest[1]).astype(bool)
+        if values.dtype.kind in 'iub':
+            values = values.astype(np.float64)
+        values[nan_mask] = missing
+
+    if encoding == 'category':
+        return pd.Series(values, dtype=object).astype(dtype)
+    if _is_numpy_dtype(dtype):
+        return values.astype(np.dtype(dtype), copy=False)
+    if encoding == 'time':
+        # tz-aware timestamps were stored as UTC nanoseconds
+        return pd.Series(values).dt.tz_localize('UTC').astype(dtype)
+    return pd.Series(values).astype(dtype)
+
+def _is_numpy_dtype(dtype):
+    try:
+        np.dtype(dtype)
+        return True
+    except TypeError:
+        return False
+
+# ---------------------------------------------------------------------------
+# lap archive
+
+def _sector_bounds(lap_df, sector_timestamps, timestamp_col):
+    """
+    Returns {sector key: [left index, right index]} so rows with timestamp_col between two
+    keys can be sliced like filter_timestamp_range.
+    """
+    if not sector_timestamps or timestamp_col not in lap_df.columns:
+        return {}
+    times = lap_df[timestamp_col].to_numpy()
+    bounds = {}
+    for key, value in sector_timestamps.items():
+        if pd.isna(value):
+            continue
+        if times.dtype.kind == 'm':
+            value = pd.Timedelta(value).to_timedelta64()
+        bounds[key] = [int(np.searchsorted(times, value, side='left')),
+                       int(np.searchsorted(times, value, side='right'))]
+    return bounds
+
+class TelemetryArchiveWriter:
+    """
+    Streams laps into a compressed archive file. Lap blocks are written as they arrive and
+    a JSON footer indexes each lap's byte range, channel segments and sector boundaries.
+
+    Usage:
+        with TelemetryArchiveWriter(path) as writer:
+            writer.write_lap(lap_number, lap_telemetry, sector_timestamps_dict[lap_number])
+    """
+
+    def __init__(self, path, timestamp_col='SessionTime'):
+        self.path = path
+        self.timestamp_col = timestamp_col
+        self.laps = {}
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + bytes([VERSION]))
+
+    def write_lap(self, lap_number, lap_df, sector_timestamps=None):
+        lap_df = lap_df.reset_index(drop=True)
+        block_offset = self._file.tell()
+        channels = []
+        for col in lap_df.columns:
+            spec, segments = encode_channel(col, lap_df[col])
+            spec['segments'] = [len(segment) for segment in segments]
+            channels.append(spec)
+            for segment in segments:
+                self._file.write(segment)
+
+        self.laps[str(int(lap_number))] = {
+            'offset': block_offset,
+            'length': self._file.tell() - block_offset,
+            'rows': len(lap_df),
+            'channels': channels,
+            'sectors': _sector_bounds(lap_df, sector_timestamps, self.timestamp_col),
+        }
+
+    def close(self):
+        if self._file.closed:
+            return
+        footer = json.dumps({'laps': self.laps, 'timestamp_col': self.timestamp_col}).encode('utf-8')
+        self._file.write(footer)
+        self._file.write(struct.pack('<Q', len(footer)) + MAGIC)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class TelemetryArchive:
+    """
+    Random-access reader for archives written by TelemetryArchiveWriter. Only the requested
+    lap's block is read from disk and decoded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(len(MAGIC) + 1)
+            if header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a telemetry archive")
+            f.seek(-(8 + len(MAGIC)), 2)
+            footer_length = struct.unpack('<Q', f.read(8))[0]
+            f.seek(-(8 + len(MAGIC) + footer_length), 2)
+            footer = json.loads(f.read(footer_length).decode('utf-8'))
+        self.laps = footer['laps']
+        self.timestamp_col = footer['timestamp_col']
+
+    @property
+    def lap_numbers(self):
+        return sorted(int(lap) for lap in self.laps)
+
+    def read_lap(self, lap_number, start=None, end=None, columns=None):
+        """
+        Returns one lap's telemetry, optionally limited to rows between the sector keys
+        start and end (e.g. 'Sector1End_Sector2Start', 'Sector2End_Sector3Start') and to
+        the given columns.
+        """
+        entry = self.laps[str(int(lap_number))]
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            block = f.read(entry['length'])
+
+        data = {}
+        position = 0
+        for spec in entry['channels']:
+            segment_lengths = spec['segments']
+            if columns is None or spec['name'] in columns:
+                segments = []
+                segment_position = position
+                for length in segment_lengths:
+                    segments.append(block[segment_position:segment_position + length])
+                    segment_position += length
+                data[spec['name']] = decode_channel(spec, segments)
+            position += sum(segment_lengths)
+
+        lap_df = pd.DataFrame(data)
+        if start is not None or end is not None:
+            sectors = entry['sectors']
+            row_start = sectors[start][0] if start is not None else 0
+            row_end = sectors[end][1] if end is not None else entry['rows']
+            lap_df = lap_df.iloc[row_start:row_end].reset_index(drop=True)
+        return lap_df
+
+    def read_laps(self, lap_numbers=None, start=None, end=None, columns=None):
+        """
+        Returns a list of lap dataframes (all laps when lap_numbers is None).
+        """
+        lap_numbers = self.lap_numbers if lap_numbers is None else lap_numbers
+        return [self.read_lap(lap, start=start, end=end, columns=columns) for lap in lap_numbers]